@@ -2,114 +2,238 @@
 
 from __future__ import annotations
 
-import importlib.metadata
-import re
-import shlex
-import subprocess
 import sys
-from argparse import ArgumentParser, ArgumentTypeError, Namespace, _SubParsersAction
-from collections.abc import Iterable, Sequence
-from datetime import datetime, timezone
-from os import PathLike, execvp
-from pathlib import Path
-
-from rich import print
-from tomlkit import dumps, parse, table
+from os import environ, execvp
+from stat import S_ISREG
+
+# Only os, sys and stat are loaded at startup, keeping the shebang path lean;
+# type checkers treat this flag as True without importing typing at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import re
+    from argparse import ArgumentParser, Namespace
+    from collections.abc import Iterable, Sequence
+    from os import PathLike
+    from pathlib import Path
+    from typing import Any, TextIO
+
+    CommandArgs = Sequence[str | PathLike[str]]
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-CommandArgs = Sequence[str | PathLike[str]]
+# Kept in sync with the subparsers registered in ``create_parser``
+_COMMAND_NAMES = frozenset({"init", "fix", "add", "remove", "stamp", "python", "pip"})
+
+# The interpreter line uvrs gives every script it creates or fixes
+SHEBANG_LINE = "#!/usr/bin/env uvrs"
+_SHEBANG_LINE_BYTES = f"{SHEBANG_LINE}\n".encode()
+
+# Subcommands whose options may be mixed in among their positional arguments
+_INTERMIXED_COMMANDS = frozenset({"fix"})
+
+
+# ANSI escape codes for the handful of rich-style markup tags uvrs uses
+_STYLES = {
+    "bold": "\x1b[1m",
+    "red": "\x1b[31m",
+    "yellow": "\x1b[33m",
+    "cyan": "\x1b[36m",
+}
+
+
+_MARKUP_TAG_PATTERN = r"\[(/|(?:bold )?(?:red|yellow|cyan))\]"
+
+
+def render_markup(text: str, *, color: bool) -> str:
+    """Convert ``[style]...[/]`` markup to ANSI codes, or strip it if not ``color``."""
+    import re
+
+    def replace(match: re.Match[str]) -> str:
+        if not color:
+            return ""
+        if match[1] == "/":
+            return "\x1b[0m"
+        return "".join(_STYLES[style] for style in match[1].split())
+
+    # re caches the compiled pattern, so repeated calls don't recompile it
+    return re.sub(_MARKUP_TAG_PATTERN, replace, text)
+
+
+def print(*objects: Any, file: TextIO | None = None) -> None:
+    """Print ``objects`` with markup rendered as color on terminals."""
+    stream = sys.stdout if file is None else file
+    color = stream.isatty() and "NO_COLOR" not in environ
+    text = " ".join(str(obj) for obj in objects)
+    stream.write(render_markup(text, color=color) + "\n")
 
 
 def readable_path(value: str) -> Path:
     """Argparse type that accepts only paths pointing to files."""
+    from argparse import ArgumentTypeError
+    from pathlib import Path
+
     path = Path(value)
-    if not path.exists():
-        raise ArgumentTypeError(f"{value} does not exist")
-    if not path.is_file():
+    # A single stat answers both "does it exist" and "is it a regular file"
+    try:
+        mode = path.stat().st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        raise ArgumentTypeError(f"{value} does not exist") from None
+    except OSError as exc:
+        # e.g. a symlink loop; argparse only reports ArgumentTypeError nicely
+        raise ArgumentTypeError(f"{value}: {exc.strerror}") from None
+    if not S_ISREG(mode):
         raise ArgumentTypeError(f"{value} is not a file")
     return path
 
 
 def args_join(args: CommandArgs) -> str:
     """Return a shell-quoted representation of ``args`` for logging."""
+    import shlex
+
     return shlex.join(str(arg) for arg in args)
 
 
+def decode_script(data: bytes) -> str:
+    """Decode script bytes as UTF-8, translating newlines as read_text() would."""
+    # LF-only newlines let the metadata scanner find blocks in CRLF scripts
+    return data.decode().replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_script(path: Path) -> str:
+    """Read a script as UTF-8 text without going through the text I/O layer."""
+    return decode_script(path.read_bytes())
+
+
+def write_script(path: Path, content: str) -> None:
+    """Write ``content`` to a script as UTF-8 without the text I/O layer."""
+    path.write_bytes(content.encode())
+
+
 def fail(message: str, exit_code: int = 1) -> None:
     """Print ``message`` to stderr and exit the process."""
     print(message, file=sys.stderr)
     raise SystemExit(exit_code)
 
 
+def uv_executable() -> str:
+    """Return the uv executable to launch, honouring ``UVRS_UV`` when set."""
+    return environ.get("UVRS_UV") or "uv"
+
+
 def run_uv_command(args: CommandArgs) -> None:
     """Log and execute a ``uv`` CLI command, preserving exit codes."""
+    import subprocess
+
     print(f"[bold cyan]→ uvrs executing:[/] {args_join(args)}")
     try:
-        subprocess.run([str(arg) for arg in args], check=True)
+        subprocess.run(
+            [str(arg) for arg in args], executable=uv_executable(), check=True
+        )
     except subprocess.CalledProcessError as exc:  # pragma: no cover
         raise SystemExit(exc.returncode) from None
 
 
+def exec_uv_command(args: CommandArgs) -> None:
+    """Log a ``uv`` CLI command and replace the current process with it."""
+    print(f"[bold cyan]→ uvrs executing:[/] {args_join(args)}")
+    # Buffered output would be lost when the process image is replaced
+    sys.stdout.flush()
+    execvp(uv_executable(), [str(arg) for arg in args])
+
+
 def run_script(args: Sequence[str]) -> None:
     """Delegate execution to ``uv run --exact --script`` replacing the current process."""
-    execvp("uv", ["uv", "run", "--exact", "--script", *args])
+    # An absolute UVRS_UV path is exec'd directly, skipping the PATH search
+    execvp(uv_executable(), ["uv", "run", "--exact", "--script", *args])
 
 
 # ---------------------------------------------------------------------------
 # PEP 723 Inline Metadata Helpers
 # ---------------------------------------------------------------------------
 
-# PEP 723 regex pattern
-METADATA_REGEX = re.compile(
-    r"""
-    ^ [#] [ ] /// [ ] script $      # "# /// script"
-    \s                              # followed by newline (and any whitespace)
-    (?P<content>
-        (                           # One or more lines of:
-            ^ [#] ( | [ ] .* ) $    # "#" (blank) or "# content"
-            \s                      # followed by newline (and any whitespace)
-        )+
-    )
-    ^ [#] [ ] /// $                 # "# ///"
-    """,
-    flags=re.MULTILINE | re.VERBOSE,
-)
+
+class MetadataBlock:
+    """Location of a PEP 723 script block and its still-commented content."""
+
+    __slots__ = ("start", "end", "content")
+
+    def __init__(self, start: int, end: int, content: str) -> None:
+        self.start = start
+        self.end = end
+        self.content = content
+
+
+def _find_metadata_block(content: str, pos: int = 0) -> MetadataBlock | None:
+    """
+    Find the first PEP 723 script block in ``content`` at or after ``pos``.
+
+    Equivalent to the reference regex from PEP 723, but jumps between
+    candidate "# /// script" lines with str.find and only walks the lines
+    of a candidate block: the block continues over consecutive "#" or
+    "# ..." lines and closes at the last "# ///" line of that run.
+    """
+    opener = "# /// script\n"
+    while (start := content.find(opener, pos)) != -1:
+        body_start = pos = start + len(opener)
+        if start and content[start - 1] != "\n":
+            continue
+
+        offset = body_start
+        close = None
+        while True:
+            newline = content.find("\n", offset)
+            line = content[offset:] if newline == -1 else content[offset:newline]
+            if line != "#" and not line.startswith("# "):
+                break
+            if line == "# ///" and offset > body_start:
+                close = offset
+            if newline == -1:
+                break
+            offset = newline + 1
+
+        if close is not None:
+            return MetadataBlock(
+                start=start,
+                end=close + len("# ///"),
+                content=content[body_start:close],
+            )
+    return None
 
 
 def get_current_timestamp() -> str:
     """Return current UTC timestamp in RFC 3339 format."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    from datetime import datetime, timezone
+
+    now = datetime.now(timezone.utc)
+    return now.isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
-def extract_metadata_block(content: str) -> re.Match[str] | None:
+def extract_metadata_block(content: str) -> MetadataBlock | None:
     """
     Extract the PEP 723 script metadata block from file content.
 
     Returns:
-        Match object or None if not found
+        MetadataBlock or None if not found
     """
-    match list(METADATA_REGEX.finditer(content)):
-        case [match]:
-            return match
-        case []:
-            return None
-        case _:
-            raise ValueError("Multiple PEP 723 script blocks found")
+    block = _find_metadata_block(content)
+    if block is None:
+        return None
+    if _find_metadata_block(content, block.end):
+        raise ValueError("Multiple PEP 723 script blocks found")
+    return block
 
 
-def parse_metadata(match: re.Match[str]) -> str:
+def parse_metadata(block: MetadataBlock) -> str:
     """
     Extract TOML content from a PEP 723 metadata block.
 
     Returns the raw TOML string (without comment prefixes).
     """
-    return "\n".join(
-        line.removeprefix("#").removeprefix(" ")
-        for line in match.group("content").splitlines()
-    )
+    # Every block line is "#" or "# ...", so a two-character slice strips the
+    # prefix from both (content always ends with the newline before "# ///")
+    return "\n".join(line[2:] for line in block.content.split("\n")[:-1])
 
 
 def format_metadata(toml_content: str) -> str:
@@ -126,28 +250,26 @@ def format_metadata(toml_content: str) -> str:
     return "# /// script\n" + "\n".join(commented_lines) + "\n# ///"
 
 
-def update_exclude_newer(script_path: Path) -> str:
+def apply_exclude_newer(content: str, timestamp: str) -> str:
     """
-    Add or update exclude-newer in the script's PEP 723 metadata.
+    Return ``content`` with exclude-newer set in its PEP 723 metadata.
 
-    Args:
-        script_path: Path to the Python script
-
-    Returns:
-        The timestamp that was set
+    Creates a minimal metadata block (after the shebang, if any) when the
+    script doesn't have one yet.
     """
-    timestamp = get_current_timestamp()
-    content = script_path.read_text()
+    # tomlkit round-trips the TOML, keeping comments and layout in the block;
+    # it is imported here so running a script never pays for it
+    from tomlkit import dumps, parse, table
 
-    if match := extract_metadata_block(content):
+    if block := extract_metadata_block(content):
         # Parse metadata TOML and update timestamp
-        doc = parse(parse_metadata(match))
+        doc = parse(parse_metadata(block))
         doc.setdefault("tool", table()).setdefault("uv", table())  # type: ignore[union-attr]
         doc["tool"]["uv"]["exclude-newer"] = timestamp  # type: ignore[index]
 
         # Format back to PEP 723 block and replace in content
         new_block = format_metadata(dumps(doc))
-        new_content = content[: match.start()] + new_block + content[match.end() :]
+        new_content = content[: block.start] + new_block + content[block.end :]
     else:
         # Create minimal PEP 723 metadata block
         new_block = format_metadata(
@@ -156,12 +278,27 @@ def update_exclude_newer(script_path: Path) -> str:
 
         # Insert after shebang if present, otherwise at start
         if content.startswith("#!"):
-            lines = content.splitlines(keepends=True)
-            new_content = lines[0] + new_block + "\n" + "".join(lines[1:])
+            shebang, _, rest = content.partition("\n")
+            new_content = f"{shebang}\n{new_block}\n{rest}"
         else:
             new_content = new_block + "\n" + content
 
-    script_path.write_text(new_content)
+    return new_content
+
+
+def update_exclude_newer(script_path: Path) -> str:
+    """
+    Add or update exclude-newer in the script's PEP 723 metadata.
+
+    Args:
+        script_path: Path to the Python script
+
+    Returns:
+        The timestamp that was set
+    """
+    timestamp = get_current_timestamp()
+    content = read_script(script_path)
+    write_script(script_path, apply_exclude_newer(content, timestamp))
     return timestamp
 
 
@@ -188,62 +325,131 @@ def handle_init(args: Namespace, extras: Sequence[str]) -> None:
 
     run_uv_command(["uv", "init", "--script", path, *extra_args])
 
-    content = path.read_text()
-    path.write_text(f"#!/usr/bin/env uvrs\n{content}")
+    # Add shebang and timestamp in memory so the script is written only once
+    content = f"{SHEBANG_LINE}\n{read_script(path)}"
+    timestamp = None if no_stamp else get_current_timestamp()
+    if timestamp:
+        content = apply_exclude_newer(content, timestamp)
+    write_script(path, content)
     path.chmod(path.stat().st_mode | 0o111)
 
     print(f"Updated shebang in `[cyan]{path}[/]`")
 
-    if not no_stamp:
-        # Add timestamp
-        timestamp = update_exclude_newer(path)
+    if timestamp:
         print(f"Set [cyan]exclude-newer[/] to [yellow]{timestamp}[/]")
 
 
-def handle_fix(args: Namespace, extras: Sequence[str]) -> None:
-    """Ensure an existing script uses the uvrs shebang."""
-    if extras:
-        fail(
-            f"[bold red]error[/]: unrecognized arguments [yellow]{args_join(extras)}[/]"
-        )
-
-    path: Path = args.path
-    no_stamp = args.no_stamp
+def fix_script(path: Path, timestamp: str | None) -> None:
+    """Give one script the uvrs shebang, executable bit and optional timestamp."""
+    if timestamp is None:
+        # Without a timestamp to write, an executable script that already
+        # starts with the shebang needs only a stat and a short read
+        current_mode = path.stat().st_mode
+        if current_mode & 0o111:
+            with path.open("rb") as file:
+                head = file.read(len(_SHEBANG_LINE_BYTES))
+            if head == _SHEBANG_LINE_BYTES:
+                print(f"Shebang already set in `[cyan]{path}[/]`")
+                return
 
-    content = path.read_text()
+    raw = path.read_bytes()
+    content = decode_script(raw)
 
     if content.startswith("#!"):
-        lines = content.splitlines()[1:]
-        new_content = "\n".join(["#!/usr/bin/env uvrs", *lines])
-        if content.endswith("\n"):
-            # Preserve trailing newline
-            new_content += "\n"
+        # Replace only the first line, leaving the rest of the file untouched
+        newline = content.find("\n")
+        rest = content[newline:] if newline != -1 else ""
+        new_content = SHEBANG_LINE + rest
     else:
-        new_content = f"#!/usr/bin/env uvrs\n{content}"
-    path.write_text(new_content)
+        new_content = f"{SHEBANG_LINE}\n{content}"
+
+    # Compare against the bytes on disk: a CRLF shebang decodes to the right
+    # text but makes the kernel look for an interpreter named "uvrs\r"
+    shebang_changed = raw.partition(b"\n")[0] != SHEBANG_LINE.encode()
+
+    # Add/update timestamp (create metadata if it doesn't exist)
+    if timestamp:
+        new_content = apply_exclude_newer(new_content, timestamp)
+    # Leave already-correct scripts untouched so their mtime is preserved
+    if new_content.encode() != raw:
+        write_script(path, new_content)
 
     current_mode = path.stat().st_mode
     if not (current_mode & 0o111):
         path.chmod(current_mode | 0o111)
 
-    print(f"Updated shebang in `[cyan]{path}[/]`")
+    if shebang_changed:
+        print(f"Updated shebang in `[cyan]{path}[/]`")
+    else:
+        print(f"Shebang already set in `[cyan]{path}[/]`")
 
-    if not no_stamp:
-        # Add/update timestamp (create metadata if it doesn't exist)
-        timestamp = update_exclude_newer(path)
+    if timestamp:
         print(f"Set [cyan]exclude-newer[/] to [yellow]{timestamp}[/]")
-        # Sync with upgrade to ensure environment is fresh
+
+
+def sync_script(path: Path) -> bool:
+    """Run ``uv sync --upgrade`` for a script, reporting failure instead of exiting."""
+    try:
         run_uv_command(["uv", "sync", "--script", path, "--upgrade"])
+    except SystemExit as exc:
+        print(
+            f"[bold red]error[/]: could not sync `[cyan]{path}[/]`: "
+            f"uv exited with status {exc.code}",
+            file=sys.stderr,
+        )
+        return False
+    return True
+
+
+def handle_fix(args: Namespace, extras: Sequence[str]) -> None:
+    """Ensure existing scripts use the uvrs shebang."""
+    if extras:
+        fail(
+            f"[bold red]error[/]: unrecognized arguments [yellow]{args_join(extras)}[/]"
+        )
+
+    paths: list[Path] = args.paths
+    timestamp = None if args.no_stamp else get_current_timestamp()
+
+    fixed: list[Path] = []
+    for path in paths:
+        try:
+            fix_script(path, timestamp)
+        except (OSError, ValueError) as exc:
+            # Report and move on so one bad script doesn't abort the batch
+            print(
+                f"[bold red]error[/]: could not fix `[cyan]{path}[/]`: {exc}",
+                file=sys.stderr,
+            )
+        else:
+            fixed.append(path)
+
+    failed = len(paths) - len(fixed)
+    if len(paths) > 1:
+        print(f"Processed {len(fixed)} of {len(paths)} scripts")
+
+    if timestamp and fixed:
+        # Sync with upgrade to ensure each environment is fresh
+        *rest, last = fixed
+        failed += sum(not sync_script(path) for path in rest)
+        if failed:
+            failed += not sync_script(last)
+        else:
+            # Nothing is left to report, so uv's exit status becomes ours
+            exec_uv_command(["uv", "sync", "--script", last, "--upgrade"])
+
+    if failed:
+        raise SystemExit(1)
 
 
 def handle_add(args: Namespace, extras: Sequence[str]) -> None:
     """Forward to ``uv add --script`` with any additional arguments."""
-    run_uv_command(["uv", "add", "--script", args.path, *extras])
+    exec_uv_command(["uv", "add", "--script", args.path, *extras])
 
 
 def handle_remove(args: Namespace, extras: Sequence[str]) -> None:
     """Forward to ``uv remove --script`` with any additional arguments."""
-    run_uv_command(["uv", "remove", "--script", args.path, *extras])
+    exec_uv_command(["uv", "remove", "--script", args.path, *extras])
 
 
 def handle_stamp(args: Namespace, extras: Sequence[str]) -> None:
@@ -260,7 +466,7 @@ def handle_stamp(args: Namespace, extras: Sequence[str]) -> None:
     print(f"Set [cyan]exclude-newer[/] to [yellow]{timestamp}[/] in `[cyan]{path}[/]`")
 
     # Upgrade requirements to match the new timestamp
-    run_uv_command(["uv", "sync", "--script", path, "--upgrade"])
+    exec_uv_command(["uv", "sync", "--script", path, "--upgrade"])
 
 
 def get_script_python_path(script_path: Path) -> Path:
@@ -269,8 +475,12 @@ def get_script_python_path(script_path: Path) -> Path:
 
     Uses `uv python find --script` to locate the correct Python interpreter.
     """
+    import subprocess
+    from pathlib import Path
+
     result = subprocess.run(
         ["uv", "python", "find", "--script", str(script_path)],
+        executable=uv_executable(),
         capture_output=True,
         text=True,
         check=True,
@@ -280,13 +490,11 @@ def get_script_python_path(script_path: Path) -> Path:
 
 def handle_python(args: Namespace, extras: Sequence[str]) -> None:
     """Run python in the context of the script's virtual environment."""
-    python_path = get_script_python_path(args.path)
+    command = [str(get_script_python_path(args.path)), *extras]
 
-    print(f"[bold cyan]→ uvrs executing:[/] {args_join([python_path, *extras])}")
-    try:
-        subprocess.run([str(python_path), *extras], check=True)
-    except subprocess.CalledProcessError as exc:  # pragma: no cover
-        raise SystemExit(exc.returncode) from None
+    print(f"[bold cyan]→ uvrs executing:[/] {args_join(command)}")
+    sys.stdout.flush()
+    execvp(command[0], command)
 
 
 def handle_pip(args: Namespace, extras: Sequence[str]) -> None:
@@ -301,7 +509,7 @@ def handle_pip(args: Namespace, extras: Sequence[str]) -> None:
 
     # Run uv pip with the script's Python
     # The --python flag needs to come after the pip subcommand
-    run_uv_command(["uv", "pip", *extras, "--python", python_path])
+    exec_uv_command(["uv", "pip", *extras, "--python", python_path])
 
 
 # ---------------------------------------------------------------------------
@@ -309,12 +517,12 @@ def handle_pip(args: Namespace, extras: Sequence[str]) -> None:
 # ---------------------------------------------------------------------------
 
 
-def _version_string() -> str:
-    return importlib.metadata.version("uvrs")
-
-
 def create_parser() -> ArgumentParser:
     """Build the top-level argparse parser."""
+    import importlib.metadata
+    from argparse import ArgumentParser
+    from pathlib import Path
+
     parser = ArgumentParser(
         prog="uvrs",
         description="Create and run uv scripts with POSIX standardized shebang line",
@@ -322,7 +530,7 @@ def create_parser() -> ArgumentParser:
     parser.add_argument(
         "--version",
         action="version",
-        version=f"uvrs {_version_string()}",
+        version=f"uvrs {importlib.metadata.version('uvrs')}",
     )
 
     subparsers = parser.add_subparsers(dest="command")
@@ -343,9 +551,9 @@ def create_parser() -> ArgumentParser:
 
     fix_parser = subparsers.add_parser(
         "fix",
-        help="Ensure a script starts with the uvrs shebang",
+        help="Ensure scripts start with the uvrs shebang",
     )
-    fix_parser.add_argument("path", type=readable_path)
+    fix_parser.add_argument("paths", nargs="+", type=readable_path, metavar="path")
     fix_parser.add_argument(
         "--no-stamp",
         action="store_true",
@@ -393,30 +601,47 @@ def create_parser() -> ArgumentParser:
     return parser
 
 
-def _command_names(parser: ArgumentParser) -> set[str]:
-    """Extract the first-level command names from the parser."""
-    return next(
-        set(action.choices.keys())
-        for action in parser._actions
-        if isinstance(action, _SubParsersAction)
-    )
+def subcommand_parser(parser: ArgumentParser, name: str) -> ArgumentParser:
+    """Return the subparser registered under ``name`` in ``parser``."""
+    from argparse import ArgumentParser, _SubParsersAction
+
+    for action in parser._actions:
+        if isinstance(action, _SubParsersAction):
+            command_parser = action.choices[name]
+            assert isinstance(command_parser, ArgumentParser)
+            return command_parser
+    raise LookupError(name)
 
 
 def main(argv: Iterable[str] | None = None) -> None:
     """Entry point for the ``uvrs`` command."""
     args_list = list(argv if argv is not None else sys.argv[1:])
 
+    # Shebang mode is the hot path: hand off to uv without building the parser
+    if (
+        args_list
+        and not args_list[0].startswith("-")
+        and args_list[0] not in _COMMAND_NAMES
+    ):
+        run_script(args_list)
+        return
+
     parser = create_parser()
     if not args_list:
         parser.print_help()
         return
 
-    if args_list[0].startswith("-") or args_list[0] in _command_names(parser):
-        namespace, extras = parser.parse_known_args(args_list)
-        handler = getattr(namespace, "handler", None)
-        if handler is None:
-            fail("No command specified")
-        assert callable(handler)
-        handler(namespace, extras)
+    command = args_list[0]
+    if command in _INTERMIXED_COMMANDS:
+        # Options may come between paths (``uvrs fix a.py --no-stamp b.py``),
+        # which parse_known_args can't handle for nargs="+" positionals; the
+        # subcommand is parsed once so each path is only stat'd once
+        command_parser = subcommand_parser(parser, command)
+        namespace, extras = command_parser.parse_known_intermixed_args(args_list[1:])
     else:
-        run_script(args_list)
+        namespace, extras = parser.parse_known_args(args_list)
+    handler = getattr(namespace, "handler", None)
+    if handler is None:
+        fail("No command specified")
+    assert callable(handler)
+    handler(namespace, extras)
@@ -2,24 +2,48 @@
 
 from __future__ import annotations
 
-import io
-import runpy
+import os
+import re
+import shutil
 import subprocess
 import sys
 import textwrap
-from argparse import Namespace
+from argparse import ArgumentParser, Namespace, _SubParsersAction
 from collections.abc import Callable, Sequence
-from contextlib import redirect_stderr, redirect_stdout
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
 
 import uvrs
 
+# Script bodies shared by several tests, dedented once at import time
+PEP723_SCRIPT = textwrap.dedent(
+    """
+    # /// script
+    # dependencies = []
+    # ///
+    print('hello')
+    """
+).strip()
+
+PEP723_SCRIPT_WITH_SHEBANG = f"#!/usr/bin/env python\n{PEP723_SCRIPT}"
+
+STAMPED_PEP723_SCRIPT = textwrap.dedent(
+    """
+    # /// script
+    # dependencies = []
+    #
+    # [tool.uv]
+    # exclude-newer = "2024-01-01T00:00:00Z"
+    # ///
+    print('hello')
+    """
+).strip()
+
 
 @dataclass
 class CommandResult:
@@ -28,68 +52,82 @@ class CommandResult:
     stderr: str
 
 
-def rich_stub(stdout: io.StringIO, stderr: io.StringIO) -> Callable[..., None]:
-    def _print(*objects: object, **kwargs: Any) -> None:
-        target = kwargs.pop("file", None)
-        stream = (
-            stdout
-            if target in (None, sys.stdout)
-            else stderr
-            if target is sys.stderr
-            else stdout
-        )
-        kwargs.pop("markup", None)
-        kwargs.pop("highlight", None)
-        print(*objects, file=stream, **kwargs)
+RunUvrs = Callable[..., CommandResult]
 
-    return _print
 
+def completed_process(stdout: str) -> subprocess.CompletedProcess[str]:
+    """Build a successful ``subprocess.run`` result for stubbing uv calls."""
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout)
 
-def run_uvrs(*args: str, check: bool = True) -> CommandResult:
-    stdout = io.StringIO()
-    stderr = io.StringIO()
-    exit_code = 0
 
-    with (
-        patch("uvrs.print", side_effect=rich_stub(stdout, stderr)),
-        redirect_stdout(stdout),
-        redirect_stderr(stderr),
-    ):
+@pytest.fixture
+def run_uvrs(capsys: pytest.CaptureFixture[str]) -> RunUvrs:
+    """Run the uvrs CLI in-process, returning its exit code and output."""
+
+    def run(*args: str, check: bool = True) -> CommandResult:
         try:
             uvrs.main(list(args))
         except SystemExit as exc:
             exit_code = int(exc.code or 0)
-        except Exception as exc:  # pragma: no cover - unexpected exception surface
-            exit_code = 1
-            stderr.write(f"{exc}\n")
         else:
             exit_code = 0
 
-    return CommandResult(
-        exit_code=exit_code,
-        stdout=stdout.getvalue(),
-        stderr=stderr.getvalue(),
-    )
+        captured = capsys.readouterr()
+        return CommandResult(
+            exit_code=exit_code,
+            stdout=captured.out,
+            stderr=captured.err,
+        )
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def mock_execvp(mocker: MockerFixture) -> MagicMock:
+    """Keep exec-based handlers from replacing the test process."""
+    return mocker.patch("uvrs.execvp")
+
+
+@pytest.fixture(autouse=True)
+def default_uv_executable(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ignore any UVRS_UV set in the developer's shell."""
+    monkeypatch.delenv("UVRS_UV", raising=False)
+
+
+@pytest.fixture(scope="module")
+def shared_script(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A plain script for tests that only pass its path along to uv."""
+    script_path = tmp_path_factory.mktemp("shared") / "script.py"
+    script_path.write_text("print('hi')\n")
+    return script_path
+
+
+@pytest.fixture
+def mock_run_uv(mocker: MockerFixture) -> MagicMock:
+    """Stand in for uv commands that uvrs runs as a child process."""
+    return mocker.patch("uvrs.run_uv_command", autospec=True)
+
+
+@pytest.fixture
+def mock_exec_uv(mocker: MockerFixture) -> MagicMock:
+    """Stand in for uv commands that replace the uvrs process."""
+    return mocker.patch("uvrs.exec_uv_command", autospec=True)
 
 
 class TestInit:
-    def test_init_creates_script(self, tmp_path: Path, mocker: MockerFixture) -> None:
+    def test_init_creates_script(
+        self,
+        tmp_path: Path,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
+    ) -> None:
         script_path = tmp_path / "test-script.py"
 
         def fake_run(args: Sequence[Any]) -> None:
             assert list(args) == ["uv", "init", "--script", script_path]
-            script_path.write_text(
-                textwrap.dedent(
-                    """
-                    # /// script
-                    # dependencies = []
-                    # ///
-                    print('hello')
-                    """
-                ).strip()
-            )
+            script_path.write_text(PEP723_SCRIPT)
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
 
         result = run_uvrs("init", str(script_path))
 
@@ -104,7 +142,8 @@ class TestInit:
     def test_init_with_python_version(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "test-script.py"
 
@@ -129,14 +168,14 @@ class TestInit:
                 ).strip()
             )
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
 
         run_uvrs("init", str(script_path), "--python", "3.12")
 
         content = script_path.read_text()
         assert 'requires-python = ">=3.12"' in content
 
-    def test_init_existing_file_fails(self, tmp_path: Path) -> None:
+    def test_init_existing_file_fails(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         script_path = tmp_path / "existing.py"
         script_path.write_text("print('hi')\n")
 
@@ -148,61 +187,48 @@ class TestInit:
     def test_init_forwards_extra_uv_args(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "extra.py"
 
         def fake_run(args: Sequence[Any]) -> None:
             assert list(args) == ["uv", "init", "--script", script_path, "--no-venv"]
-            script_path.write_text(
-                textwrap.dedent(
-                    """
-                    # /// script
-                    # dependencies = []
-                    # ///
-                    print('hi')
-                    """
-                ).strip()
-            )
+            script_path.write_text(PEP723_SCRIPT)
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
 
         run_uvrs("init", str(script_path), "--no-venv")
 
     def test_init_handles_uv_failure(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "script.py"
 
         def fake_run(args: Sequence[Any]) -> None:
             raise SystemExit(42)
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
 
         result = run_uvrs("init", str(script_path), check=False)
 
         assert result.exit_code == 42
 
     def test_init_no_stamp_skips_timestamp(
-        self, tmp_path: Path, mocker: MockerFixture
+        self,
+        tmp_path: Path,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "test-script.py"
 
         def fake_run(args: Sequence[Any]) -> None:
-            script_path.write_text(
-                textwrap.dedent(
-                    """
-                    # /// script
-                    # dependencies = []
-                    # ///
-                    print('hello')
-                    """
-                ).strip()
-            )
+            script_path.write_text(PEP723_SCRIPT)
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
 
         result = run_uvrs("init", str(script_path), "--no-stamp")
 
@@ -213,24 +239,27 @@ class TestInit:
 
 
 class TestFix:
-    def test_fix_adds_shebang(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "no-shebang.py"
-        script_path.write_text("print('hello')\n")
-
-        run_uvrs("fix", str(script_path))
-
-        content = script_path.read_text()
-        assert content.startswith("#!/usr/bin/env uvrs\n")
-
-    def test_fix_updates_existing_shebang(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "with-shebang.py"
-        script_path.write_text("#!/usr/bin/env python\nprint('hi')\n")
+    @pytest.mark.parametrize(
+        "initial",
+        [
+            "print('hello')\n",
+            "#!/usr/bin/env python\nprint('hi')\n",
+            "#!/usr/bin/env -S uv run --script\nprint('hi')\n",
+            "",
+        ],
+        ids=["no-shebang", "python", "uv-run", "empty"],
+    )
+    def test_fix_sets_shebang(
+        self, tmp_path: Path, run_uvrs: RunUvrs, initial: str
+    ) -> None:
+        script_path = tmp_path / "script.py"
+        script_path.write_text(initial)
 
         run_uvrs("fix", str(script_path))
 
         assert script_path.read_text().startswith("#!/usr/bin/env uvrs\n")
 
-    def test_fix_requires_file(self, tmp_path: Path) -> None:
+    def test_fix_requires_file(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         directory = tmp_path / "not-a-file"
         directory.mkdir()
 
@@ -239,11 +268,20 @@ class TestFix:
         assert result.exit_code == 2
         assert "is not a file" in result.stderr
 
-    def test_fix_rejects_extra_args(self, tmp_path: Path) -> None:
+    def test_fix_reports_symlink_loop(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
+        loop = tmp_path / "loop.py"
+        loop.symlink_to(loop)
+
+        result = run_uvrs("fix", str(loop), check=False)
+
+        assert result.exit_code == 2
+        assert "Too many levels of symbolic links" in result.stderr
+
+    def test_fix_rejects_extra_args(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         script_path = tmp_path / "test.py"
         script_path.write_text("print('hi')\n")
 
-        result = run_uvrs("fix", str(script_path), "extra", check=False)
+        result = run_uvrs("fix", str(script_path), "--extra", check=False)
 
         assert result.exit_code == 1
         assert "unrecognized arguments" in result.stderr
@@ -251,22 +289,11 @@ class TestFix:
     def test_fix_adds_timestamp_to_pep723_script(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "script.py"
-        script_path.write_text(
-            textwrap.dedent(
-                """
-                #!/usr/bin/env python
-                # /// script
-                # dependencies = []
-                # ///
-                print('hello')
-                """
-            ).strip()
-        )
-
-        mock_run = mocker.patch("uvrs.run_uv_command")
+        script_path.write_text(PEP723_SCRIPT_WITH_SHEBANG)
 
         result = run_uvrs("fix", str(script_path))
 
@@ -276,24 +303,50 @@ class TestFix:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
         # Should call uv sync --script <path> --upgrade
-        mock_run.assert_called_once_with(
+        mock_exec_uv.assert_called_once_with(
             ["uv", "sync", "--script", script_path, "--upgrade"]
         )
 
-    def test_fix_no_stamp_skips_timestamp(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text(
-            textwrap.dedent(
-                """
-                #!/usr/bin/env python
-                # /// script
-                # dependencies = []
-                # ///
-                print('hello')
-                """
-            ).strip()
+    @pytest.mark.usefixtures("mock_exec_uv")
+    def test_fix_stamps_existing_crlf_metadata_block(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "crlf.py"
+        script_path.write_bytes(
+            b"#!/usr/bin/env python\r\n"
+            b"# /// script\r\n"
+            b'# dependencies = ["rich"]\r\n'
+            b"# ///\r\n"
+            b"print(1)\r\n"
         )
 
+        result = run_uvrs("fix", str(script_path))
+
+        assert result.exit_code == 0
+        content = script_path.read_text()
+        assert content.startswith("#!/usr/bin/env uvrs\n")
+        assert content.count("# /// script") == 1
+        assert 'dependencies = ["rich"]' in content
+        assert "exclude-newer" in content
+
+    def test_fix_no_stamp_rewrites_crlf_shebang(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "crlf.py"
+        script_path.write_bytes(b"#!/usr/bin/env uvrs\r\nprint(1)\r\n")
+
+        result = run_uvrs("fix", str(script_path), "--no-stamp")
+
+        assert result.exit_code == 0
+        assert "Updated shebang" in result.stdout
+        assert script_path.read_bytes() == b"#!/usr/bin/env uvrs\nprint(1)\n"
+
+    def test_fix_no_stamp_skips_timestamp(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "script.py"
+        script_path.write_text(PEP723_SCRIPT_WITH_SHEBANG)
+
         result = run_uvrs("fix", str(script_path), "--no-stamp")
 
         assert result.exit_code == 0
@@ -301,16 +354,15 @@ class TestFix:
         assert content.startswith("#!/usr/bin/env uvrs\n")
         assert "exclude-newer" not in content
 
+    @pytest.mark.usefixtures("mock_exec_uv")
     def test_fix_creates_metadata_for_plain_script(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
     ) -> None:
         script_path = tmp_path / "plain-script.py"
         script_path.write_text("#!/usr/bin/env python\nprint('hello')\n")
 
-        mocker.patch("uvrs.run_uv_command")
-
         result = run_uvrs("fix", str(script_path))
 
         assert result.exit_code == 0
@@ -323,7 +375,9 @@ class TestFix:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
 
-    def test_fix_preserves_trailing_newline(self, tmp_path: Path) -> None:
+    def test_fix_preserves_trailing_newline(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
         """Test that fix preserves trailing newline."""
         script_path = tmp_path / "with-newline.py"
         # Create a file with trailing newline
@@ -335,7 +389,9 @@ class TestFix:
         assert content.endswith("\n"), "Trailing newline should be preserved"
         assert content.startswith("#!/usr/bin/env uvrs\n")
 
-    def test_fix_handles_file_without_trailing_newline(self, tmp_path: Path) -> None:
+    def test_fix_handles_file_without_trailing_newline(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
         """Test that fix handles files without trailing newline."""
         script_path = tmp_path / "no-newline.py"
         # Create a file without trailing newline
@@ -347,22 +403,158 @@ class TestFix:
         assert not content.endswith("\n"), "Should not add trailing newline if missing"
         assert content.startswith("#!/usr/bin/env uvrs\n")
 
+    def test_fix_replaces_shebang_only_line(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "only-shebang.py"
+        script_path.write_text("#!/usr/bin/env python")
 
-class TestStamp:
-    def test_stamp_adds_timestamp(self, tmp_path: Path, mocker: MockerFixture) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text(
-            textwrap.dedent(
-                """
-                # /// script
-                # dependencies = []
-                # ///
-                print('hello')
-                """
-            ).strip()
+        run_uvrs("fix", str(script_path), "--no-stamp")
+
+        assert script_path.read_text() == "#!/usr/bin/env uvrs"
+
+    def test_fix_preserves_utf8_content(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "unicode.py"
+        script_path.write_bytes("print('héllo ✓')\n".encode())
+
+        run_uvrs("fix", str(script_path), "--no-stamp")
+
+        assert script_path.read_bytes() == (
+            "#!/usr/bin/env uvrs\nprint('héllo ✓')\n".encode()
+        )
+
+    def test_fix_handles_multiple_scripts(
+        self,
+        tmp_path: Path,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
+        mock_exec_uv: MagicMock,
+    ) -> None:
+        first = tmp_path / "first.py"
+        second = tmp_path / "second.py"
+        first.write_text("print('one')\n")
+        second.write_text("#!/usr/bin/env python\nprint('two')\n")
+
+        result = run_uvrs("fix", str(first), str(second))
+
+        assert result.exit_code == 0
+        assert "Processed 2 of 2 scripts" in result.stdout
+        for path in (first, second):
+            content = path.read_text()
+            assert content.startswith("#!/usr/bin/env uvrs\n")
+            assert "exclude-newer" in content
+        mock_run_uv.assert_called_once_with(
+            ["uv", "sync", "--script", first, "--upgrade"]
+        )
+        mock_exec_uv.assert_called_once_with(
+            ["uv", "sync", "--script", second, "--upgrade"]
         )
 
-        mock_run = mocker.patch("uvrs.run_uv_command")
+    def test_fix_continues_past_bad_script(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        bad = tmp_path / "bad.py"
+        good = tmp_path / "good.py"
+        bad.write_bytes(b"print('\xff')\n")
+        good.write_text("print('ok')\n")
+
+        result = run_uvrs("fix", str(bad), str(good), "--no-stamp", check=False)
+
+        assert result.exit_code == 1
+        assert "could not fix" in result.stderr
+        assert str(bad) in result.stderr
+        assert "Processed 1 of 2 scripts" in result.stdout
+        assert bad.read_bytes() == b"print('\xff')\n"
+        assert good.read_text().startswith("#!/usr/bin/env uvrs\n")
+
+    def test_fix_accepts_options_between_paths(
+        self, tmp_path: Path, mocker: MockerFixture, run_uvrs: RunUvrs
+    ) -> None:
+        first = tmp_path / "first.py"
+        second = tmp_path / "second.py"
+        first.write_text("print('one')\n")
+        second.write_text("print('two')\n")
+        stat_check = mocker.spy(uvrs, "readable_path")
+
+        result = run_uvrs("fix", str(first), "--no-stamp", str(second))
+
+        assert result.exit_code == 0
+        assert "Processed 2 of 2 scripts" in result.stdout
+        for path in (first, second):
+            content = path.read_text()
+            assert content.startswith("#!/usr/bin/env uvrs\n")
+            assert "exclude-newer" not in content
+        # Each path is validated by a single parse
+        assert stat_check.call_count == 2
+
+    def test_fix_keeps_syncing_past_failed_sync(
+        self,
+        tmp_path: Path,
+        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
+        mock_exec_uv: MagicMock,
+    ) -> None:
+        paths = [tmp_path / f"script{index}.py" for index in range(3)]
+        for path in paths:
+            path.write_text("print('hi')\n")
+
+        mock_run_uv.side_effect = [SystemExit(2), None, None]
+
+        result = run_uvrs("fix", *map(str, paths), check=False)
+
+        assert result.exit_code == 1
+        assert "could not sync" in result.stderr
+        assert str(paths[0]) in result.stderr
+        assert mock_run_uv.call_args_list == [
+            mocker.call(["uv", "sync", "--script", path, "--upgrade"]) for path in paths
+        ]
+        mock_exec_uv.assert_not_called()
+
+    def test_fix_leaves_correct_script_untouched(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "already-fixed.py"
+        script_path.write_text("#!/usr/bin/env uvrs\nprint('hello')\n")
+        script_path.chmod(0o644)
+        os.utime(script_path, (0, 0))
+
+        result = run_uvrs("fix", str(script_path), "--no-stamp")
+
+        assert result.exit_code == 0
+        assert "Shebang already set" in result.stdout
+        assert script_path.stat().st_mtime == 0
+        assert script_path.stat().st_mode & 0o111
+
+    def test_fix_skips_full_read_for_fixed_executable(
+        self,
+        tmp_path: Path,
+        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+    ) -> None:
+        script_path = tmp_path / "already-fixed.py"
+        script_path.write_text("#!/usr/bin/env uvrs\nprint('hello')\n")
+        script_path.chmod(0o755)
+        read_script = mocker.spy(uvrs, "read_script")
+
+        result = run_uvrs("fix", str(script_path), "--no-stamp")
+
+        assert result.exit_code == 0
+        assert "Shebang already set" in result.stdout
+        read_script.assert_not_called()
+
+
+class TestStamp:
+    def test_stamp_adds_timestamp(
+        self,
+        tmp_path: Path,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
+    ) -> None:
+        script_path = tmp_path / "script.py"
+        script_path.write_text(PEP723_SCRIPT)
 
         result = run_uvrs("stamp", str(script_path))
 
@@ -371,50 +563,61 @@ class TestStamp:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
         # Should call uv sync --script <path> --upgrade
-        mock_run.assert_called_once_with(
+        mock_exec_uv.assert_called_once_with(
             ["uv", "sync", "--script", script_path, "--upgrade"]
         )
 
+    @pytest.mark.usefixtures("mock_exec_uv")
     def test_stamp_updates_existing_timestamp(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+    ) -> None:
+        script_path = tmp_path / "script.py"
+        script_path.write_text(STAMPED_PEP723_SCRIPT)
+
+        result = run_uvrs("stamp", str(script_path))
+
+        assert result.exit_code == 0
+        content = script_path.read_text()
+        assert "exclude-newer" in content
+        # Should have a new timestamp (not the old one)
+        assert "2024-01-01T00:00:00Z" not in content
+
+    @pytest.mark.usefixtures("mock_exec_uv")
+    def test_stamp_keeps_metadata_comments(
+        self, tmp_path: Path, run_uvrs: RunUvrs
     ) -> None:
         script_path = tmp_path / "script.py"
         script_path.write_text(
             textwrap.dedent(
                 """
                 # /// script
-                # dependencies = []
-                #
-                # [tool.uv]
-                # exclude-newer = "2024-01-01T00:00:00Z"
+                # requires-python = ">=3.12"  # need match
+                # dependencies = ["requests<3", "rich"]  # pinned
                 # ///
                 print('hello')
                 """
-            ).strip()
+            ).lstrip()
         )
 
-        mocker.patch("uvrs.run_uv_command")
-
         result = run_uvrs("stamp", str(script_path))
 
         assert result.exit_code == 0
         content = script_path.read_text()
+        assert '# requires-python = ">=3.12"  # need match\n' in content
+        assert '# dependencies = ["requests<3", "rich"]  # pinned\n' in content
         assert "exclude-newer" in content
-        # Should have a new timestamp (not the old one)
-        assert "2024-01-01T00:00:00Z" not in content
 
+    @pytest.mark.usefixtures("mock_exec_uv")
     def test_stamp_creates_metadata_with_shebang(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
     ) -> None:
         script_path = tmp_path / "script.py"
         script_path.write_text("#!/usr/bin/env python\nprint('hello')\n")
 
-        mocker.patch("uvrs.run_uv_command")
-
         result = run_uvrs("stamp", str(script_path))
 
         assert result.exit_code == 0
@@ -426,34 +629,47 @@ class TestStamp:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
 
-    def test_stamp_rejects_extra_args(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text(
-            textwrap.dedent(
-                """
-                # /// script
-                # dependencies = []
-                # ///
-                print('hello')
-                """
-            ).strip()
+    @pytest.mark.usefixtures("mock_exec_uv")
+    def test_stamp_updates_crlf_metadata_block(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
+        script_path = tmp_path / "crlf.py"
+        script_path.write_bytes(
+            b"# /// script\r\n"
+            b"# dependencies = []\r\n"
+            b"#\r\n"
+            b"# [tool.uv]\r\n"
+            b'# exclude-newer = "2024-01-01T00:00:00Z"\r\n'
+            b"# ///\r\n"
+            b"print('hello')\r\n"
         )
 
+        result = run_uvrs("stamp", str(script_path))
+
+        assert result.exit_code == 0
+        content = script_path.read_text()
+        assert content.count("# /// script") == 1
+        assert content.count("exclude-newer") == 1
+        assert "2024-01-01T00:00:00Z" not in content
+
+    def test_stamp_rejects_extra_args(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
+        script_path = tmp_path / "script.py"
+        script_path.write_text(PEP723_SCRIPT)
+
         result = run_uvrs("stamp", str(script_path), "extra", check=False)
 
         assert result.exit_code == 1
         assert "unrecognized arguments" in result.stderr
 
+    @pytest.mark.usefixtures("mock_exec_uv")
     def test_stamp_creates_metadata_if_missing(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
     ) -> None:
         script_path = tmp_path / "script.py"
         script_path.write_text("print('hello')\n")
 
-        mocker.patch("uvrs.run_uv_command")
-
         result = run_uvrs("stamp", str(script_path))
 
         assert result.exit_code == 0
@@ -464,112 +680,111 @@ class TestStamp:
         assert "exclude-newer" in content
 
 
+@pytest.mark.parametrize("command", ["add", "remove"])
 class TestAddRemove:
-    def test_add_forwards_arguments(
+    def test_forwards_arguments(
         self,
-        tmp_path: Path,
-        mocker: MockerFixture,
+        command: str,
+        shared_script: Path,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        mock_run = mocker.patch("uvrs.run_uv_command")
+        run_uvrs(command, str(shared_script), "requests", "--dev")
 
-        run_uvrs("add", str(script_path), "requests", "--dev")
-
-        mock_run.assert_called_once_with(
-            ["uv", "add", "--script", script_path, "requests", "--dev"]
+        mock_exec_uv.assert_called_once_with(
+            ["uv", command, "--script", shared_script, "requests", "--dev"]
         )
 
-    def test_add_allows_no_dependencies(
+    def test_allows_no_dependencies(
         self,
-        tmp_path: Path,
-        mocker: MockerFixture,
+        command: str,
+        shared_script: Path,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        mock_run = mocker.patch("uvrs.run_uv_command")
-
-        result = run_uvrs("add", str(script_path))
+        result = run_uvrs(command, str(shared_script))
 
         assert result.exit_code == 0
-        mock_run.assert_called_once_with(["uv", "add", "--script", script_path])
+        mock_exec_uv.assert_called_once_with(["uv", command, "--script", shared_script])
 
-    def test_remove_forwards_arguments(
-        self,
-        tmp_path: Path,
-        mocker: MockerFixture,
+    def test_missing_script_errors(
+        self, command: str, tmp_path: Path, run_uvrs: RunUvrs
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        mock_run = mocker.patch("uvrs.run_uv_command")
-
-        run_uvrs("remove", str(script_path), "requests")
-
-        mock_run.assert_called_once_with(
-            ["uv", "remove", "--script", script_path, "requests"]
-        )
-
-    def test_remove_allows_no_dependencies(
-        self,
-        tmp_path: Path,
-        mocker: MockerFixture,
-    ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        mock_run = mocker.patch("uvrs.run_uv_command")
-
-        result = run_uvrs("remove", str(script_path))
-
-        assert result.exit_code == 0
-        mock_run.assert_called_once_with(["uv", "remove", "--script", script_path])
-
-    def test_add_missing_script_errors(self, tmp_path: Path) -> None:
         script_path = tmp_path / "missing.py"
 
-        result = run_uvrs("add", str(script_path), "requests", check=False)
-
-        assert result.exit_code == 2
-        assert "does not exist" in result.stderr
-
-    def test_remove_missing_script_errors(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "missing.py"
-
-        result = run_uvrs("remove", str(script_path), "requests", check=False)
+        result = run_uvrs(command, str(script_path), "requests", check=False)
 
         assert result.exit_code == 2
         assert "does not exist" in result.stderr
 
 
 class TestMainBehaviour:
-    def test_main_no_args_prints_help(self) -> None:
+    def test_main_no_args_prints_help(self, run_uvrs: RunUvrs) -> None:
         result = run_uvrs(check=False)
         assert "usage:" in result.stdout
 
-    def test_main_script_invokes_run_script(self, mocker: MockerFixture) -> None:
+    @pytest.mark.parametrize(
+        ("argv", "runs_script"),
+        [
+            (["script.py", "--flag"], True),
+            (["./init"], True),
+            (["init", "script.py"], False),
+            (["pip", "script.py", "list"], False),
+            (["--version"], False),
+        ],
+    )
+    def test_main_dispatch(
+        self,
+        mocker: MockerFixture,
+        argv: list[str],
+        runs_script: bool,
+    ) -> None:
         mock_run_script = mocker.patch("uvrs.run_script")
-        uvrs.main(["script.py", "--flag"])
-        mock_run_script.assert_called_once_with(["script.py", "--flag"])
+        mock_create_parser = mocker.patch("uvrs.create_parser")
+        handler = MagicMock()
+        mock_create_parser.return_value.parse_known_args.return_value = (
+            Namespace(handler=handler),
+            [],
+        )
+
+        uvrs.main(argv)
 
-    def test_main_run_script_error(self, mocker: MockerFixture) -> None:
+        if runs_script:
+            mock_run_script.assert_called_once_with(argv)
+            mock_create_parser.assert_not_called()
+        else:
+            mock_run_script.assert_not_called()
+            handler.assert_called_once()
+
+    def test_command_names_match_parser(self) -> None:
+        parser = uvrs.create_parser()
+        subparsers = next(
+            action
+            for action in parser._actions
+            if isinstance(action, _SubParsersAction)
+        )
+        assert set(subparsers.choices) == uvrs._COMMAND_NAMES
+
+    def test_main_run_script_error(
+        self, mocker: MockerFixture, run_uvrs: RunUvrs
+    ) -> None:
         mocker.patch("uvrs.run_script", side_effect=lambda args: uvrs.fail("boom"))
         result = run_uvrs("script.py", check=False)
         assert result.exit_code == 1
         assert "boom" in result.stderr
 
-    def test_main_version_flag(self) -> None:
+    def test_main_version_flag(self, run_uvrs: RunUvrs) -> None:
         result = run_uvrs("--version", check=False)
         assert result.exit_code == 0
         assert result.stdout.strip().startswith("uvrs ")
 
-    def test_main_no_handler_specified(self, mocker: MockerFixture) -> None:
+    def test_main_no_handler_specified(
+        self, mocker: MockerFixture, run_uvrs: RunUvrs
+    ) -> None:
         # Create a namespace without a handler attribute
         namespace = Namespace()
         mocker.patch.object(
-            uvrs.ArgumentParser, "parse_known_args", return_value=(namespace, [])
+            ArgumentParser, "parse_known_args", return_value=(namespace, [])
         )
 
         result = run_uvrs("init", check=False)
@@ -580,23 +795,15 @@ class TestMainBehaviour:
     def test_main_command_paths_to_handler(
         self,
         tmp_path: Path,
-        mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_run_uv: MagicMock,
     ) -> None:
         script_path = tmp_path / "script.py"
 
         def fake_run(args: Sequence[Any]) -> None:
-            script_path.write_text(
-                textwrap.dedent(
-                    """
-                    # /// script
-                    # dependencies = []
-                    # ///
-                    print('hi')
-                    """
-                ).strip()
-            )
+            script_path.write_text(PEP723_SCRIPT)
 
-        mocker.patch("uvrs.run_uv_command", side_effect=fake_run)
+        mock_run_uv.side_effect = fake_run
         run_uvrs("init", str(script_path))
         assert script_path.exists()
 
@@ -604,7 +811,10 @@ class TestMainBehaviour:
 class TestModuleEntry:
     def test_dunder_main_invokes_main(self, mocker: MockerFixture) -> None:
         mock_main = mocker.patch("uvrs.main")
-        runpy.run_module("uvrs.__main__", run_name="__main__")
+        # Execute __main__.py directly rather than through runpy's module lookup
+        main_path = Path(uvrs.__file__).with_name("__main__.py")
+        code = compile(main_path.read_text(), str(main_path), "exec")
+        exec(code, {"__name__": "__main__"})
         mock_main.assert_called_once_with()
 
 
@@ -626,6 +836,51 @@ class TestPEP723Helpers:
         with pytest.raises(ValueError, match="Multiple PEP 723 script blocks found"):
             uvrs.extract_metadata_block(content)
 
+    def test_extract_metadata_block_without_block_returns_none(self) -> None:
+        content = "#!/usr/bin/env python\n# ///\nprint('hello')\n"
+
+        assert uvrs.extract_metadata_block(content) is None
+
+    def test_extract_metadata_block_ends_at_last_closing_line(self) -> None:
+        content = textwrap.dedent(
+            """
+            # /// script
+            # dependencies = []
+            # ///
+            # embedded = true
+            # ///
+            print('hello')
+            """
+        ).lstrip()
+
+        block = uvrs.extract_metadata_block(content)
+
+        assert block is not None
+        assert content[block.start : block.end].endswith("# embedded = true\n# ///")
+        assert block.content == "# dependencies = []\n# ///\n# embedded = true\n"
+
+    def test_apply_exclude_newer_inserts_block_after_shebang(self) -> None:
+        content = "#!/usr/bin/env uvrs\nprint('hello')\n"
+
+        result = uvrs.apply_exclude_newer(content, "2025-01-01T00:00:00Z")
+
+        assert result == (
+            "#!/usr/bin/env uvrs\n"
+            "# /// script\n"
+            "# dependencies = []\n"
+            "#\n"
+            "# [tool.uv]\n"
+            '# exclude-newer = "2025-01-01T00:00:00Z"\n'
+            "# ///\n"
+            "print('hello')\n"
+        )
+
+    def test_apply_exclude_newer_after_shebang_only_script(self) -> None:
+        result = uvrs.apply_exclude_newer("#!/usr/bin/env uvrs", "2025-01-01T00:00:00Z")
+
+        assert result.startswith("#!/usr/bin/env uvrs\n# /// script\n")
+        assert result.endswith("# ///\n")
+
     def test_parse_metadata_handles_empty_comment_lines(self) -> None:
         # Edge case: lines that are just # (blank lines in TOML)
         content = textwrap.dedent(
@@ -648,10 +903,34 @@ class TestPEP723Helpers:
         assert "\n\n" in result  # The blank line should create an empty line in TOML
 
 
+@pytest.mark.integration
 class TestIntegration:
     """Integration tests that actually run uv commands (no mocking)."""
 
-    def test_init_with_real_uv(self, tmp_path: Path) -> None:
+    @pytest.fixture(autouse=True)
+    def exec_in_subprocess(self, mocker: MockerFixture) -> None:
+        """Run exec'd commands as child processes so the test run survives."""
+
+        def fake_execvp(file: str, args: list[str]) -> None:
+            completed = subprocess.run(
+                args, executable=file, capture_output=True, text=True
+            )
+            sys.stdout.write(completed.stdout)
+            sys.stderr.write(completed.stderr)
+            raise SystemExit(completed.returncode)
+
+        mocker.patch("uvrs.execvp", side_effect=fake_execvp)
+
+    @pytest.fixture(scope="session")
+    def initialized_script_template(
+        self, tmp_path_factory: pytest.TempPathFactory
+    ) -> Path:
+        """Run ``uvrs init`` once and share the script it creates."""
+        template = tmp_path_factory.mktemp("template") / "script.py"
+        uvrs.main(["init", str(template)])
+        return template
+
+    def test_init_with_real_uv(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         """Test uvrs init creates a working script with real uv."""
         script_path = tmp_path / "test-script.py"
 
@@ -665,12 +944,17 @@ class TestIntegration:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
 
-    def test_stamp_with_real_uv(self, tmp_path: Path) -> None:
+    def test_stamp_with_real_uv(
+        self,
+        tmp_path: Path,
+        initialized_script_template: Path,
+        run_uvrs: RunUvrs,
+    ) -> None:
         """Test uvrs stamp actually runs uv sync --script --upgrade."""
         script_path = tmp_path / "stamp-test.py"
 
         # First create a script
-        run_uvrs("init", str(script_path))
+        shutil.copy(initialized_script_template, script_path)
 
         # Read the initial timestamp
         content_before = script_path.read_text()
@@ -690,7 +974,7 @@ class TestIntegration:
         # Timestamp should be different (later)
         assert content_after != content_before
 
-    def test_fix_with_real_uv(self, tmp_path: Path) -> None:
+    def test_fix_with_real_uv(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         """Test uvrs fix with real uv on a script with dependencies."""
         script_path = tmp_path / "fix-test.py"
 
@@ -715,12 +999,17 @@ class TestIntegration:
         assert "[tool.uv]" in content
         assert "exclude-newer" in content
 
-    def test_add_and_remove_with_real_uv(self, tmp_path: Path) -> None:
+    def test_add_and_remove_with_real_uv(
+        self,
+        tmp_path: Path,
+        initialized_script_template: Path,
+        run_uvrs: RunUvrs,
+    ) -> None:
         """Test uvrs add and remove actually modify dependencies."""
         script_path = tmp_path / "deps-test.py"
 
         # Create script
-        run_uvrs("init", str(script_path))
+        shutil.copy(initialized_script_template, script_path)
 
         # Add a dependency
         result = run_uvrs("add", str(script_path), "requests")
@@ -736,7 +1025,9 @@ class TestIntegration:
         content = script_path.read_text()
         assert "requests" not in content
 
-    def test_init_no_stamp_with_real_uv(self, tmp_path: Path) -> None:
+    def test_init_no_stamp_with_real_uv(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
         """Test uvrs init --no-stamp doesn't add timestamp."""
         script_path = tmp_path / "no-stamp-test.py"
 
@@ -747,12 +1038,17 @@ class TestIntegration:
         assert "exclude-newer" not in content
         assert "[tool.uv]" not in content
 
-    def test_stamp_does_not_add_extra_newlines(self, tmp_path: Path) -> None:
+    def test_stamp_does_not_add_extra_newlines(
+        self,
+        tmp_path: Path,
+        initialized_script_template: Path,
+        run_uvrs: RunUvrs,
+    ) -> None:
         """Test that running stamp multiple times doesn't add extra newlines."""
         script_path = tmp_path / "newline-test.py"
 
         # Create a script
-        run_uvrs("init", str(script_path))
+        shutil.copy(initialized_script_template, script_path)
 
         # Count newlines after first stamp
         content_1 = script_path.read_text()
@@ -776,7 +1072,9 @@ class TestIntegration:
             f"Third:\n{content_3}"
         )
 
-    def test_stamp_creates_metadata_for_plain_script(self, tmp_path: Path) -> None:
+    def test_stamp_creates_metadata_for_plain_script(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
         """Test that stamp can add metadata to a plain Python script."""
         script_path = tmp_path / "plain-script.py"
         script_path.write_text("#!/usr/bin/env python\nprint('hello world')\n")
@@ -798,6 +1096,7 @@ class TestIntegration:
     def test_fix_creates_metadata_for_plain_script_integration(
         self,
         tmp_path: Path,
+        run_uvrs: RunUvrs,
     ) -> None:
         """Test that fix can add metadata to a plain Python script with real uv."""
         script_path = tmp_path / "plain-script.py"
@@ -817,13 +1116,19 @@ class TestIntegration:
         # Original code should be preserved
         assert "print('hello world')" in content
 
-    def test_python_with_real_uv(self, tmp_path: Path) -> None:
+    def test_python_with_real_uv(
+        self,
+        tmp_path: Path,
+        initialized_script_template: Path,
+        run_uvrs: RunUvrs,
+    ) -> None:
         """Test uvrs python runs commands in the script's environment."""
         script_path = tmp_path / "python-test.py"
 
-        # Create a script with a dependency
-        run_uvrs("init", str(script_path))
+        # Create a script with a dependency and sync its environment
+        shutil.copy(initialized_script_template, script_path)
         run_uvrs("add", str(script_path), "rich")
+        run_uvrs("stamp", str(script_path))
 
         # Use uvrs python to check if rich is importable
         result = run_uvrs(
@@ -837,12 +1142,17 @@ class TestIntegration:
         # Should be able to import rich from the script's environment
         assert "SUCCESS" in result.stdout
 
-    def test_pip_with_real_uv(self, tmp_path: Path) -> None:
+    def test_pip_with_real_uv(
+        self,
+        tmp_path: Path,
+        initialized_script_template: Path,
+        run_uvrs: RunUvrs,
+    ) -> None:
         """Test uvrs pip operates on the script's environment."""
         script_path = tmp_path / "pip-test.py"
 
         # Create a script with a dependency
-        run_uvrs("init", str(script_path))
+        shutil.copy(initialized_script_template, script_path)
         run_uvrs("add", str(script_path), "rich")
 
         # Use uvrs pip to list packages
@@ -857,69 +1167,63 @@ class TestIntegration:
 class TestPip:
     def test_pip_runs_uv_pip_with_python_flag(
         self,
-        tmp_path: Path,
+        shared_script: Path,
         mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        fake_python = tmp_path / "venv" / "bin" / "python3"
+        fake_python = shared_script.parent / "venv" / "bin" / "python3"
         mock_find = mocker.patch(
             "subprocess.run",
-            side_effect=[
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-            ],
+            return_value=completed_process(str(fake_python)),
         )
-        mock_uv = mocker.patch("uvrs.run_uv_command")
 
-        result = run_uvrs("pip", str(script_path), "list")
+        result = run_uvrs("pip", str(shared_script), "list")
 
         assert result.exit_code == 0
         # Should find the Python path
-        assert mock_find.call_args_list[0][0][0] == [
+        mock_find.assert_called_once()
+        assert mock_find.call_args.args[0] == [
             "uv",
             "python",
             "find",
             "--script",
-            str(script_path),
+            str(shared_script),
         ]
         # Should call uv pip with --python flag
-        mock_uv.assert_called_once_with(["uv", "pip", "list", "--python", fake_python])
+        mock_exec_uv.assert_called_once_with(
+            ["uv", "pip", "list", "--python", fake_python]
+        )
 
     def test_pip_forwards_multiple_arguments(
         self,
-        tmp_path: Path,
+        shared_script: Path,
         mocker: MockerFixture,
+        run_uvrs: RunUvrs,
+        mock_exec_uv: MagicMock,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        fake_python = tmp_path / "venv" / "bin" / "python3"
+        fake_python = shared_script.parent / "venv" / "bin" / "python3"
         mocker.patch(
             "subprocess.run",
-            side_effect=[
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-            ],
+            return_value=completed_process(str(fake_python)),
         )
-        mock_uv = mocker.patch("uvrs.run_uv_command")
 
-        result = run_uvrs("pip", str(script_path), "show", "rich", "--verbose")
+        result = run_uvrs("pip", str(shared_script), "show", "rich", "--verbose")
 
         assert result.exit_code == 0
-        mock_uv.assert_called_once_with(
+        mock_exec_uv.assert_called_once_with(
             ["uv", "pip", "show", "rich", "--verbose", "--python", fake_python]
         )
 
-    def test_pip_requires_subcommand(self, tmp_path: Path) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        result = run_uvrs("pip", str(script_path), check=False)
+    def test_pip_requires_subcommand(
+        self, shared_script: Path, run_uvrs: RunUvrs
+    ) -> None:
+        result = run_uvrs("pip", str(shared_script), check=False)
 
         assert result.exit_code == 1
         assert "pip command requires a subcommand" in result.stderr
 
-    def test_pip_missing_script_errors(self, tmp_path: Path) -> None:
+    def test_pip_missing_script_errors(self, tmp_path: Path, run_uvrs: RunUvrs) -> None:
         script_path = tmp_path / "missing.py"
 
         result = run_uvrs("pip", str(script_path), "list", check=False)
@@ -931,87 +1235,72 @@ class TestPip:
 class TestPython:
     def test_python_runs_script_python(
         self,
-        tmp_path: Path,
+        shared_script: Path,
         mocker: MockerFixture,
+        mock_execvp: MagicMock,
+        run_uvrs: RunUvrs,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
         # Mock uv python find to return a fake Python path
-        fake_python = tmp_path / "venv" / "bin" / "python3"
+        fake_python = shared_script.parent / "venv" / "bin" / "python3"
         mock_find = mocker.patch(
             "subprocess.run",
-            side_effect=[
-                # First call: uv python find --script
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-                # Second call: actual python execution
-                mocker.Mock(returncode=0),
-            ],
+            return_value=completed_process(str(fake_python)),
         )
 
-        result = run_uvrs("python", str(script_path), "-c", "print('test')")
+        result = run_uvrs("python", str(shared_script), "-c", "print('test')")
 
         assert result.exit_code == 0
         # Should call uv python find first
-        assert mock_find.call_args_list[0][0][0] == [
+        mock_find.assert_called_once()
+        assert mock_find.call_args.args[0] == [
             "uv",
             "python",
             "find",
             "--script",
-            str(script_path),
-        ]
-        # Then should call the python executable with the args
-        assert mock_find.call_args_list[1][0][0] == [
-            str(fake_python),
-            "-c",
-            "print('test')",
+            str(shared_script),
         ]
+        # Then should replace the process with the python executable
+        mock_execvp.assert_called_once_with(
+            str(fake_python), [str(fake_python), "-c", "print('test')"]
+        )
 
     def test_python_allows_no_extra_args(
         self,
-        tmp_path: Path,
+        shared_script: Path,
         mocker: MockerFixture,
+        mock_execvp: MagicMock,
+        run_uvrs: RunUvrs,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        fake_python = tmp_path / "venv" / "bin" / "python3"
-        mock_find = mocker.patch(
+        fake_python = shared_script.parent / "venv" / "bin" / "python3"
+        mocker.patch(
             "subprocess.run",
-            side_effect=[
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-                mocker.Mock(returncode=0),
-            ],
+            return_value=completed_process(str(fake_python)),
         )
 
-        result = run_uvrs("python", str(script_path))
+        result = run_uvrs("python", str(shared_script))
 
         assert result.exit_code == 0
         # Should call python with no extra args
-        assert mock_find.call_args_list[1][0][0] == [str(fake_python)]
+        assert mock_execvp.call_args.args[1] == [str(fake_python)]
 
     def test_python_forwards_all_arguments(
         self,
-        tmp_path: Path,
+        shared_script: Path,
         mocker: MockerFixture,
+        mock_execvp: MagicMock,
+        run_uvrs: RunUvrs,
     ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
-
-        fake_python = tmp_path / "venv" / "bin" / "python3"
-        mock_find = mocker.patch(
+        fake_python = shared_script.parent / "venv" / "bin" / "python3"
+        mocker.patch(
             "subprocess.run",
-            side_effect=[
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-                mocker.Mock(returncode=0),
-            ],
+            return_value=completed_process(str(fake_python)),
         )
 
-        result = run_uvrs("python", str(script_path), "-m", "ast", "dump", "test.py")
+        result = run_uvrs("python", str(shared_script), "-m", "ast", "dump", "test.py")
 
         assert result.exit_code == 0
         # Should forward all args to python
-        assert mock_find.call_args_list[1][0][0] == [
+        assert mock_execvp.call_args.args[1] == [
             str(fake_python),
             "-m",
             "ast",
@@ -1019,7 +1308,9 @@ class TestPython:
             "test.py",
         ]
 
-    def test_python_missing_script_errors(self, tmp_path: Path) -> None:
+    def test_python_missing_script_errors(
+        self, tmp_path: Path, run_uvrs: RunUvrs
+    ) -> None:
         script_path = tmp_path / "missing.py"
 
         result = run_uvrs("python", str(script_path), "-c", "print('hi')", check=False)
@@ -1027,53 +1318,79 @@ class TestPython:
         assert result.exit_code == 2
         assert "does not exist" in result.stderr
 
-    def test_python_handles_execution_failure(
-        self,
-        tmp_path: Path,
-        mocker: MockerFixture,
-    ) -> None:
-        script_path = tmp_path / "script.py"
-        script_path.write_text("print('hi')\n")
 
-        fake_python = tmp_path / "venv" / "bin" / "python3"
-        mocker.patch(
-            "subprocess.run",
-            side_effect=[
-                mocker.Mock(stdout=str(fake_python), returncode=0),
-                subprocess.CalledProcessError(42, ["python"]),
-            ],
+class TestHelpers:
+    @pytest.fixture
+    def mock_subprocess_run(self, mocker: MockerFixture) -> MagicMock:
+        """Stand in for subprocess.run, succeeding unless told otherwise."""
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.returncode = 0
+        return mock_run
+
+    def test_run_script_invokes_execvp(self, mock_execvp: MagicMock) -> None:
+        uvrs.run_script(["script.py", "--flag"])
+
+        mock_execvp.assert_called_once_with(
+            "uv", ["uv", "run", "--exact", "--script", "script.py", "--flag"]
         )
 
-        result = run_uvrs("python", str(script_path), "-c", "bad code", check=False)
+    def test_get_current_timestamp_is_rfc3339_utc(self) -> None:
+        timestamp = uvrs.get_current_timestamp()
 
-        assert result.exit_code == 42
+        assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", timestamp)
 
+    def test_render_markup_with_color(self) -> None:
+        rendered = uvrs.render_markup("[bold red]error[/]: [cyan]x[/]", color=True)
 
-class TestHelpers:
-    def test_run_script_invokes_execvp(self, mocker: MockerFixture) -> None:
-        mock_execvp = mocker.patch("uvrs.execvp")
+        assert rendered == "\x1b[1m\x1b[31merror\x1b[0m: \x1b[36mx\x1b[0m"
 
-        uvrs.run_script(["script.py", "--flag"])
+    def test_render_markup_without_color_keeps_other_brackets(self) -> None:
+        rendered = uvrs.render_markup("[yellow]uv add requests[socks][/]", color=False)
+
+        assert rendered == "uv add requests[socks]"
+
+    def test_run_script_uses_uvrs_uv(
+        self,
+        mock_execvp: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("UVRS_UV", "/opt/uv/bin/uv")
+
+        uvrs.run_script(["script.py"])
 
         mock_execvp.assert_called_once_with(
-            "uv", ["uv", "run", "--exact", "--script", "script.py", "--flag"]
+            "/opt/uv/bin/uv", ["uv", "run", "--exact", "--script", "script.py"]
         )
 
-    def test_run_uv_command_success(self, mocker: MockerFixture) -> None:
-        mock_print = mocker.patch("uvrs.print")
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value.returncode = 0
+    def test_exec_uv_command_replaces_process(
+        self,
+        mock_execvp: MagicMock,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        uvrs.exec_uv_command(["uv", "sync", "--script", Path("script.py")])
+
+        assert capsys.readouterr().out == (
+            "→ uvrs executing: uv sync --script script.py\n"
+        )
+        mock_execvp.assert_called_once_with(
+            "uv", ["uv", "sync", "--script", "script.py"]
+        )
 
+    def test_run_uv_command_success(
+        self,
+        mock_subprocess_run: MagicMock,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
         uvrs.run_uv_command(["uv", "--version"])
 
-        mock_run.assert_called_once_with(["uv", "--version"], check=True)
-        mock_print.assert_any_call("[bold cyan]→ uvrs executing:[/] uv --version")
+        mock_subprocess_run.assert_called_once_with(
+            ["uv", "--version"], executable="uv", check=True
+        )
+        assert capsys.readouterr().out == "→ uvrs executing: uv --version\n"
 
-    def test_run_uv_command_failure(self, mocker: MockerFixture) -> None:
-        mocker.patch("uvrs.print")
-        mocker.patch(
-            "subprocess.run",
-            side_effect=subprocess.CalledProcessError(5, ["uv", "bad"]),
+    def test_run_uv_command_failure(self, mock_subprocess_run: MagicMock) -> None:
+        mock_subprocess_run.side_effect = subprocess.CalledProcessError(
+            5, ["uv", "bad"]
         )
 
         with pytest.raises(SystemExit) as exc: